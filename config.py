@@ -1,22 +1,40 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-
-load_dotenv()
 
-MIRO_CLIENT_ID = os.getenv("MIRO_CLIENT_ID")
-MIRO_CLIENT_SECRET = os.getenv("MIRO_CLIENT_SECRET")
-MIRO_REDIRECT_URL = os.getenv("MIRO_REDIRECT_URL", "http://localhost:8080/callback")
+from dotenv import load_dotenv
 
-TOKEN_STORAGE_DIR = Path.home() / ".miro-mcp"
-TOKEN_STORAGE_FILE = TOKEN_STORAGE_DIR / "tokens.json"
 
-TOKEN_STORAGE_DIR.mkdir(exist_ok=True)
+@dataclass(frozen=True)
+class Config:
+    client_id: str
+    client_secret: str
+    redirect_url: str
+    token_file: Path
 
 
-def validate_config():
+def validate_config(config: Config) -> None:
     # Validate required environment variables are set
-    if not MIRO_CLIENT_ID:
+    if not config.client_id:
         raise ValueError("MIRO_CLIENT_ID environment variable is required")
-    if not MIRO_CLIENT_SECRET:
+    if not config.client_secret:
         raise ValueError("MIRO_CLIENT_SECRET environment variable is required")
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    # Load, validate, and cache environment configuration once per process
+    load_dotenv()
+
+    token_dir = Path.home() / ".miro-mcp"
+    token_dir.mkdir(exist_ok=True)
+
+    config = Config(
+        client_id=os.getenv("MIRO_CLIENT_ID"),
+        client_secret=os.getenv("MIRO_CLIENT_SECRET"),
+        redirect_url=os.getenv("MIRO_REDIRECT_URL", "http://localhost:8080/callback"),
+        token_file=token_dir / "tokens.json",
+    )
+    validate_config(config)
+    return config
@@ -1,10 +1,42 @@
-import json
+import importlib
 import sys
 import traceback
+
+import orjson
 from typing import Any, Dict, Optional, Callable
 from miro_client import MiroClient
-from tool_registry import TOOLS
-from tools import shape_tools, group_tools, auth_tools, board_tools
+from tool_registry import tools_list_bytes
+
+# Tool modules register themselves via register_tool on import; defer that
+# until the first tools/list or tools/call so initialize-only sessions skip it
+_TOOL_MODULES = ('tools.shape_tools', 'tools.group_tools', 'tools.auth_tools', 'tools.board_tools')
+_tools_loaded = False
+
+# Tool name -> handler mapping, populated once the tool modules are loaded
+_TOOL_ROUTER: Dict[str, Callable] = {}
+
+
+def _ensure_tools_loaded() -> None:
+    # Import tool modules on first use to trigger registration
+    global _tools_loaded
+    if _tools_loaded:
+        return
+    for module_name in _TOOL_MODULES:
+        importlib.import_module(module_name)
+
+    from tools import shape_tools, group_tools, auth_tools, board_tools
+    _TOOL_ROUTER.update({
+        'create_shape': shape_tools.handle_tool_call,
+        'create_shapes_batch': shape_tools.handle_tool_call,
+        'update_shape': shape_tools.handle_tool_call,
+        'delete_shape': shape_tools.handle_tool_call,
+        'group_shapes': group_tools.handle_tool_call,
+        'ungroup_shapes': group_tools.handle_tool_call,
+        'get_auth_url': auth_tools.handle_tool_call,
+        'exchange_auth_code': auth_tools.handle_tool_call,
+        'get_board': board_tools.handle_tool_call
+    })
+    _tools_loaded = True
 
 
 def handle_initialize(params: Dict[str, Any]) -> Dict[str, Any]:
@@ -21,16 +53,18 @@ def handle_initialize(params: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def handle_tools_list() -> Dict[str, Any]:
-    # Return list of all registered tools
-    return {
-        'tools': list(TOOLS.values())
-    }
+def handle_tools_list() -> bytes:
+    # Return the cached pre-encoded tool list; process_request splices the
+    # bytes into the response envelope without re-serializing the schemas
+    _ensure_tools_loaded()
+    return tools_list_bytes()
 
 
 def handle_tools_call(tool_name: str, arguments: Dict[str, Any], get_miro_client: Callable[[], MiroClient]) -> Dict[str, Any]:
-    # Execute tool by routing to appropriate handler
-    if tool_name not in TOOLS:
+    # Execute tool via single dict lookup instead of chained string compares
+    _ensure_tools_loaded()
+    handler = _TOOL_ROUTER.get(tool_name)
+    if handler is None:
         return {
             'content': [{
                 'type': 'text',
@@ -38,30 +72,14 @@ def handle_tools_call(tool_name: str, arguments: Dict[str, Any], get_miro_client
             }],
             'isError': True
         }
-    
+
     try:
         miro_client = get_miro_client()
-        
-        if tool_name in ['create_shape', 'update_shape', 'delete_shape']:
-            result = shape_tools.handle_tool_call(tool_name, arguments, miro_client)
-        elif tool_name in ['group_shapes', 'ungroup_shapes']:
-            result = group_tools.handle_tool_call(tool_name, arguments, miro_client)
-        elif tool_name.startswith('get_auth') or tool_name.startswith('exchange_auth'):
-            result = auth_tools.handle_tool_call(tool_name, arguments, miro_client)
-        elif tool_name == 'get_board':
-            result = board_tools.handle_tool_call(tool_name, arguments, miro_client)
-        else:
-            return {
-                'content': [{
-                    'type': 'text',
-                    'text': f'No handler for tool: {tool_name}'
-                }],
-                'isError': True
-            }
+        result = handler(tool_name, arguments, miro_client)
         return {
             'content': [{
                 'type': 'text',
-                'text': json.dumps(result, indent=2)
+                'text': orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode()
             }]
         }
     except Exception as e:
@@ -74,20 +92,25 @@ def handle_tools_call(tool_name: str, arguments: Dict[str, Any], get_miro_client
         }
 
 
-def process_request(request: Dict[str, Any], get_miro_client: Callable[[], MiroClient]) -> Optional[Dict[str, Any]]:
-    # Process JSON-RPC request and route to appropriate handler
+# Method -> handler table with adapter closures so signatures unify
+_METHOD_HANDLERS: Dict[str, Callable] = {
+    'initialize': lambda params, get_miro_client: handle_initialize(params),
+    'tools/list': lambda params, get_miro_client: handle_tools_list(),
+    'tools/call': lambda params, get_miro_client: handle_tools_call(
+        params.get('name'), params.get('arguments', {}), get_miro_client
+    )
+}
+
+
+def process_request(request: Dict[str, Any], get_miro_client: Callable[[], MiroClient]) -> Optional[Any]:
+    # Process JSON-RPC request and route via single dict lookup
     method = request.get('method')
     params = request.get('params', {})
     request_id = request.get('id')
-    
-    if method == 'initialize':
-        response = handle_initialize(params)
-    elif method == 'tools/list':
-        response = handle_tools_list()
-    elif method == 'tools/call':
-        tool_name = params.get('name')
-        arguments = params.get('arguments', {})
-        response = handle_tools_call(tool_name, arguments, get_miro_client)
+
+    handler = _METHOD_HANDLERS.get(method)
+    if handler is not None:
+        response = handler(params, get_miro_client)
     else:
         # Notifications don't need responses
         if request_id is not None:
@@ -102,6 +125,10 @@ def process_request(request: Dict[str, Any], get_miro_client: Callable[[], MiroC
         return None
     
     if request_id is not None:
+        if isinstance(response, bytes):
+            # Pre-encoded result payload: build the envelope by concatenation
+            return (b'{"jsonrpc":"2.0","id":' + orjson.dumps(request_id)
+                    + b',"result":' + response + b'}')
         return {
             'jsonrpc': '2.0',
             'id': request_id,
@@ -126,23 +153,26 @@ def main():
                 sys.stderr.flush()
                 raise
         return miro_client
-    
-    # Tool modules are imported at top level to trigger registration
-    
+
+    # Write responses straight to the stdout buffer to skip print's
+    # str -> bytes re-encode; orjson handles the JSON-RPC framing
+    out = sys.stdout.buffer
+
     # Main loop: read JSON-RPC requests from stdin
     for line in sys.stdin:
         line = line.strip()
         if not line:
             continue
-        
+
         try:
-            request = json.loads(line)
+            request = orjson.loads(line)
             response = process_request(request, get_miro_client)
-            
+
             if response:
-                print(json.dumps(response))
-                sys.stdout.flush()
-        except json.JSONDecodeError as e:
+                out.write(response if isinstance(response, bytes) else orjson.dumps(response))
+                out.write(b'\n')
+                out.flush()
+        except orjson.JSONDecodeError as e:
             error_response = {
                 'jsonrpc': '2.0',
                 'id': None,
@@ -151,8 +181,9 @@ def main():
                     'message': f'Parse error: {str(e)}'
                 }
             }
-            print(json.dumps(error_response))
-            sys.stdout.flush()
+            out.write(orjson.dumps(error_response))
+            out.write(b'\n')
+            out.flush()
         except Exception as e:
             print(f"Error processing request: {e}", file=sys.stderr)
             traceback.print_exc(file=sys.stderr)
@@ -165,8 +196,9 @@ def main():
                     'message': f'Internal error: {str(e)}'
                 }
             }
-            print(json.dumps(error_response))
-            sys.stdout.flush()
+            out.write(orjson.dumps(error_response))
+            out.write(b'\n')
+            out.flush()
 
 
 if __name__ == '__main__':
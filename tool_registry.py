@@ -1,12 +1,30 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+
+import fastjsonschema
+import orjson
 
 TOOLS: Dict[str, Dict[str, Any]] = {}
 
+# Compiled argument validators, one per registered tool; bounded by the
+# number of tools so the cache cannot grow
+_VALIDATORS: Dict[str, Callable] = {}
+
+# Precomputed required-field tuples, derived once from each tool's schema
+_REQUIRED: Dict[str, tuple] = {}
+
+# Pre-encoded per-tool envelopes, serialized once at registration; the
+# tools/list payload is assembled by joining these verbatim
+_TOOL_ENVELOPES: Dict[str, bytes] = {}
+
+# Pre-encoded tools/list payload; invalidated whenever a tool is registered
+_tools_list_cache: Optional[bytes] = None
+
 
 def register_tool(name: str, description: str, parameters: Dict[str, Any]):
     # Register tool with MCP server for discovery
+    global _tools_list_cache
     required = [k for k, v in parameters.items() if v.get('required', False)]
-    
+
     TOOLS[name] = {
         'name': name,
         'description': description,
@@ -16,4 +34,57 @@ def register_tool(name: str, description: str, parameters: Dict[str, Any]):
             'required': required
         }
     }
+    # Compile the argument validator once at registration; per-call
+    # validation is then a cached function call, not a schema recompile.
+    # Fields default to required unless explicitly marked optional; the
+    # per-field 'required' marker is stripped since it is not a valid
+    # JSON Schema property keyword.
+    _REQUIRED[name] = tuple(k for k, v in parameters.items() if v.get('required', True))
+    _VALIDATORS[name] = fastjsonschema.compile({
+        'type': 'object',
+        'properties': {
+            k: {pk: pv for pk, pv in v.items() if pk != 'required'}
+            for k, v in parameters.items()
+        },
+        'required': [k for k, v in parameters.items() if v.get('required', True)]
+    })
+    _TOOL_ENVELOPES[name] = orjson.dumps(TOOLS[name])
+    _tools_list_cache = None
+
+
+def register_tools(tools: Dict[str, tuple]) -> None:
+    # Register a module's tools in one pass from {name: (description, params)}
+    for name, (description, parameters) in tools.items():
+        register_tool(name, description, parameters)
+
+
+def validate_arguments(name: str, arguments: Dict[str, Any]) -> Optional[str]:
+    # Run the precompiled validator for a tool; returns an error message or None.
+    # Presence is checked first against the precomputed required tuple with
+    # `is None` so numeric zero counts as present.
+    required = _REQUIRED.get(name)
+    if required:
+        missing = [k for k in required if arguments.get(k) is None]
+        if len(missing) == 1:
+            return f'{missing[0]} is required'
+        if missing:
+            return f'{" and ".join([", ".join(missing[:-1]), missing[-1]])} are required'
+
+    validator = _VALIDATORS.get(name)
+    if validator is None:
+        return None
+    try:
+        validator(arguments)
+    except fastjsonschema.JsonSchemaException as e:
+        return str(e)
+    return None
+
 
+def tools_list_bytes() -> bytes:
+    # Splice the per-tool envelopes into the tools/list payload without
+    # re-serializing any schema; the joined bytes are cached until the next
+    # registration
+    global _tools_list_cache
+    if _tools_list_cache is None:
+        _tools_list_cache = b'{"tools":[' + b','.join(_TOOL_ENVELOPES.values()) + b']}'
+    return _tools_list_cache
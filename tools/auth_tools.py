@@ -1,7 +1,11 @@
-from typing import Any, Dict
-from miro_client import MiroClient
+from __future__ import annotations
+
+from typing import Any, Dict, TYPE_CHECKING
 from tool_registry import register_tool
 
+if TYPE_CHECKING:
+    from miro_client import MiroClient
+
 register_tool(
     'get_auth_url',
     'Get the OAuth 2.0 authorization URL to authenticate with Miro',
@@ -20,6 +24,10 @@ register_tool(
 )
 
 
+# Shared error response, allocated once and treated as immutable
+_ERR_CODE = {'error': 'code parameter is required'}
+
+
 def handle_tool_call(tool_name: str, arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
     # Route auth tool calls to appropriate handler
     if tool_name == 'get_auth_url':
@@ -36,7 +44,7 @@ def handle_tool_call(tool_name: str, arguments: Dict[str, Any], miro_client: Mir
     elif tool_name == 'exchange_auth_code':
         code = arguments.get('code')
         if not code:
-            return {'error': 'code parameter is required'}
+            return _ERR_CODE
         
         try:
             result = miro_client.exchange_code_for_token(code)
@@ -1,7 +1,11 @@
-from typing import Any, Dict
-from miro_client import MiroClient
+from __future__ import annotations
+
+from typing import Any, Dict, TYPE_CHECKING
 from tool_registry import register_tool
 
+if TYPE_CHECKING:
+    from miro_client import MiroClient
+
 register_tool(
     'get_board',
     'Get information about a Miro board including metadata, name, description, and settings',
@@ -14,13 +18,17 @@ register_tool(
 )
 
 
+# Shared error response, allocated once and treated as immutable
+_ERR_BOARD_ID = {'error': 'board_id is required'}
+
+
 def handle_tool_call(tool_name: str, arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
     # Route board tool calls to appropriate handler
     if tool_name == 'get_board':
         board_id = arguments.get('board_id')
-        
+
         if not board_id:
-            return {'error': 'board_id is required'}
+            return _ERR_BOARD_ID
         
         try:
             result = miro_client.get_board(board_id)
@@ -1,7 +1,11 @@
-from typing import Any, Dict
-from miro_client import MiroClient
+from __future__ import annotations
+
+from typing import Any, Dict, TYPE_CHECKING
 from tool_registry import register_tool
 
+if TYPE_CHECKING:
+    from miro_client import MiroClient
+
 register_tool(
     'group_shapes',
     'Group multiple shapes together on a board',
@@ -36,16 +40,23 @@ register_tool(
 )
 
 
+# Shared error responses for the common validation failures; allocated once
+# and treated as immutable so error-heavy flows skip per-call dict builds
+_ERR_BOARD_ID = {'error': 'board_id parameter is required'}
+_ERR_ITEM_IDS = {'error': 'item_ids must be a list with at least 2 item IDs'}
+_ERR_BOARD_GROUP_ID = {'error': 'board_id and group_id are required'}
+
+
 def handle_tool_call(tool_name: str, arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
     # Route group tool calls to appropriate handler
     if tool_name == 'group_shapes':
         board_id = arguments.get('board_id')
         item_ids = arguments.get('item_ids')
-        
+
         if not board_id:
-            return {'error': 'board_id parameter is required'}
+            return _ERR_BOARD_ID
         if not item_ids or not isinstance(item_ids, list) or len(item_ids) < 2:
-            return {'error': 'item_ids must be a list with at least 2 item IDs'}
+            return _ERR_ITEM_IDS
         
         try:
             result = miro_client.group_shapes(board_id, item_ids)
@@ -62,7 +73,7 @@ def handle_tool_call(tool_name: str, arguments: Dict[str, Any], miro_client: Mir
         group_id = arguments.get('group_id')
         
         if not board_id or not group_id:
-            return {'error': 'board_id and group_id are required'}
+            return _ERR_BOARD_GROUP_ID
         
         try:
             result = miro_client.ungroup_shapes(board_id, group_id)
@@ -1,227 +1,406 @@
-from typing import Any, Dict, Optional
-from miro_client import MiroClient
-from tool_registry import register_tool
-
-register_tool(
-    'create_shape',
-    'Create a shape on a Miro board',
-    {
-        'board_id': {
-            'type': 'string',
-            'description': 'The ID of the board'
-        },
-        'shape_type': {
-            'type': 'string',
-            'description': 'Type of shape: rectangle, circle, triangle, star, arrow, etc.',
-            'enum': ['rectangle', 'circle', 'triangle', 'star', 'arrow', 'rhombus', 'octagon', 'hexagon']
-        },
-        'x': {
-            'type': 'number',
-            'description': 'X coordinate of the shape position'
-        },
-        'y': {
-            'type': 'number',
-            'description': 'Y coordinate of the shape position'
-        },
-        'width': {
-            'type': 'number',
-            'description': 'Width of the shape'
-        },
-        'height': {
-            'type': 'number',
-            'description': 'Height of the shape'
-        },
-        'fillColor': {
-            'type': 'string',
-            'description': 'Fill color in hex format (e.g., #FF0000)',
-            'required': False
-        },
-        'borderColor': {
-            'type': 'string',
-            'description': 'Border color in hex format (e.g., #000000)',
-            'required': False
-        },
-        'borderWidth': {
-            'type': 'number',
-            'description': 'Border width in pixels',
-            'required': False
-        },
-        'content': {
-            'type': 'string',
-            'description': 'Text content to display in the shape',
-            'required': False
-        }
+# MiroClient is only referenced in annotations; importing it lazily keeps
+# the HTTP/SDK import cost off the tool-registration cold path
+from __future__ import annotations
+
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from operator import itemgetter
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+from tool_registry import register_tools, validate_arguments
+
+if TYPE_CHECKING:
+    from miro_client import MiroClient
+
+# Opt-in memoization of identical update_shape calls: agent loops often
+# re-issue the same instruction back to back. Set a TTL in seconds to
+# enable; 0 (the default) disables caching so reads are never stale.
+_UPDATE_CACHE_MAX = 256
+_update_cache: Dict[tuple, tuple] = {}
+
+
+@lru_cache(maxsize=1)
+def _update_cache_ttl() -> float:
+    # Read the TTL lazily so values from .env are visible (load_dotenv only
+    # runs on first use, after tool modules are imported); a value that is
+    # not a number leaves the cache disabled instead of failing every call
+    from dotenv import load_dotenv
+    load_dotenv()
+    try:
+        return float(os.getenv('MIRO_MCP_UPDATE_CACHE_TTL', '0'))
+    except ValueError:
+        return 0.0
+
+# Supported shape types; the tuple preserves the advertised enum order and
+# the frozenset gives O(1) membership checks with interned strings
+_SHAPE_TYPE_ENUM = ('rectangle', 'circle', 'triangle', 'star', 'arrow', 'rhombus', 'octagon', 'hexagon')
+_SHAPE_TYPES = frozenset(_SHAPE_TYPE_ENUM)
+
+# Shared field definitions composed into each tool's schema so the
+# create/update descriptions cannot drift apart; the proxies keep the
+# shared groups read-only
+_BOARD_ID_FIELD = MappingProxyType({
+    'board_id': {
+        'type': 'string',
+        'description': 'The ID of the board'
+    }
+})
+_SHAPE_TYPE_FIELD = MappingProxyType({
+    'shape_type': {
+        'type': 'string',
+        'description': 'Type of shape: rectangle, circle, triangle, star, arrow, etc.',
+        'enum': list(_SHAPE_TYPE_ENUM)
     }
-)
-
-register_tool(
-    'update_shape',
-    'Update properties of an existing shape',
-    {
-        'board_id': {
-            'type': 'string',
-            'description': 'The ID of the board'
-        },
-        'item_id': {
-            'type': 'string',
-            'description': 'The ID of the shape item to update'
-        },
-        'x': {
-            'type': 'number',
-            'description': 'New X coordinate (optional)',
-            'required': False
-        },
-        'y': {
-            'type': 'number',
-            'description': 'New Y coordinate (optional)',
-            'required': False
-        },
-        'width': {
-            'type': 'number',
-            'description': 'New width (optional)',
-            'required': False
-        },
-        'height': {
-            'type': 'number',
-            'description': 'New height (optional)',
-            'required': False
-        },
-        'fillColor': {
-            'type': 'string',
-            'description': 'New fill color in hex format (optional)',
-            'required': False
-        },
-        'borderColor': {
-            'type': 'string',
-            'description': 'New border color in hex format (optional)',
-            'required': False
-        },
-        'borderWidth': {
-            'type': 'number',
-            'description': 'New border width in pixels (optional)',
-            'required': False
-        },
-        'content': {
-            'type': 'string',
-            'description': 'New text content (optional)',
-            'required': False
+})
+_POSITION_FIELDS = MappingProxyType({
+    'x': {
+        'type': 'number',
+        'description': 'X coordinate of the shape position'
+    },
+    'y': {
+        'type': 'number',
+        'description': 'Y coordinate of the shape position'
+    }
+})
+_GEOMETRY_FIELDS = MappingProxyType({
+    'width': {
+        'type': 'number',
+        'description': 'Width of the shape'
+    },
+    'height': {
+        'type': 'number',
+        'description': 'Height of the shape'
+    }
+})
+_STYLE_FIELDS = MappingProxyType({
+    'fillColor': {
+        'type': 'string',
+        'description': 'Fill color in hex format (e.g., #FF0000)',
+        'required': False
+    },
+    'borderColor': {
+        'type': 'string',
+        'description': 'Border color in hex format (e.g., #000000)',
+        'required': False
+    },
+    'borderWidth': {
+        'type': 'number',
+        'description': 'Border width in pixels',
+        'required': False
+    }
+})
+_CONTENT_FIELD = MappingProxyType({
+    'content': {
+        'type': 'string',
+        'description': 'Text content to display in the shape',
+        'required': False
+    }
+})
+
+
+def _optional(fields) -> Dict[str, Any]:
+    # Copy a field group with every field marked optional
+    return {k: {**v, 'required': False} for k, v in fields.items()}
+
+
+def _plain(fields) -> Dict[str, Any]:
+    # Copy a field group without the registry's per-field required markers,
+    # for embedding inside nested JSON Schema
+    return {k: {pk: pv for pk, pv in v.items() if pk != 'required'} for k, v in fields.items()}
+
+
+# All shape tools registered in one pass: {name: (description, parameters)}
+_SHAPE_TOOLS = {
+    'create_shape': (
+        'Create a shape on a Miro board',
+        {
+            **_BOARD_ID_FIELD,
+            **_SHAPE_TYPE_FIELD,
+            **_POSITION_FIELDS,
+            **_GEOMETRY_FIELDS,
+            **_STYLE_FIELDS,
+            **_CONTENT_FIELD
+        }
+    ),
+    'update_shape': (
+        'Update properties of an existing shape',
+        {
+            **_BOARD_ID_FIELD,
+            'item_id': {
+                'type': 'string',
+                'description': 'The ID of the shape item to update'
+            },
+            **_optional(_POSITION_FIELDS),
+            **_optional(_GEOMETRY_FIELDS),
+            **_STYLE_FIELDS,
+            **_CONTENT_FIELD
+        }
+    ),
+    'create_shapes_batch': (
+        'Create multiple shapes on a Miro board in a single call',
+        {
+            **_BOARD_ID_FIELD,
+            'shapes': {
+                'type': 'array',
+                'description': 'List of shape specs to create',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        **_SHAPE_TYPE_FIELD,
+                        **_POSITION_FIELDS,
+                        **_GEOMETRY_FIELDS,
+                        **_plain(_STYLE_FIELDS),
+                        **_plain(_CONTENT_FIELD)
+                    },
+                    'required': ['shape_type', 'x', 'y', 'width', 'height']
+                }
+            }
         }
+    ),
+    'delete_shape': (
+        'Delete a shape from a board',
+        {
+            **_BOARD_ID_FIELD,
+            'item_id': {
+                'type': 'string',
+                'description': 'The ID of the shape item to delete'
+            }
+        }
+    )
+}
+
+register_tools(_SHAPE_TOOLS)
+
+
+@dataclass(frozen=True)
+class ShapeArgs:
+    # Typed view of a validated shape spec; fields are coerced once at
+    # construction so handlers skip repeated dict lookups and float() casts
+    board_id: str
+    shape_type: str
+    x: float
+    y: float
+    width: float
+    height: float
+    fillColor: Optional[str] = None
+    borderColor: Optional[str] = None
+    borderWidth: Optional[float] = None
+    content: Optional[str] = None
+
+    @classmethod
+    def from_arguments(cls, arguments: Dict[str, Any]) -> 'ShapeArgs':
+        fill_color = arguments.get('fillColor')
+        border_color = arguments.get('borderColor')
+        border_width = arguments.get('borderWidth')
+        return cls(
+            board_id=arguments['board_id'],
+            shape_type=arguments['shape_type'],
+            x=float(arguments['x']),
+            y=float(arguments['y']),
+            width=float(arguments['width']),
+            height=float(arguments['height']),
+            fillColor=_normalize_color(fill_color) if fill_color else None,
+            borderColor=_normalize_color(border_color) if border_color else None,
+            borderWidth=float(border_width) if border_width is not None else None,
+            content=arguments.get('content')
+        )
+
+    def style(self) -> Dict[str, Any]:
+        # Style dict for the client; 0 is a valid borderWidth
+        style = {}
+        if self.fillColor:
+            style['fillColor'] = self.fillColor
+        if self.borderColor:
+            style['borderColor'] = self.borderColor
+        if self.borderWidth is not None:
+            style['borderWidth'] = self.borderWidth
+        return style
+
+
+_COLOR_RE = re.compile(r'^#[0-9A-Fa-f]{6}$')
+
+
+@lru_cache(maxsize=256)
+def _normalize_color(color: str) -> str:
+    # Validate and canonicalize a hex color once per distinct string;
+    # interning makes repeated equality checks pointer comparisons
+    if not _COLOR_RE.match(color):
+        raise ValueError(f'Invalid hex color: {color}')
+    return sys.intern(color.upper())
+
+
+_STYLE_KEYS = ('fillColor', 'borderColor', 'borderWidth')
+
+
+def _build_style_dict(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    # Extract style properties from arguments in a single pass;
+    # 0 is a valid borderWidth so only the colors are truthiness-filtered
+    return {
+        k: float(v) if k == 'borderWidth' else _normalize_color(v)
+        for k in _STYLE_KEYS
+        if (v := arguments.get(k)) is not None and (k == 'borderWidth' or v)
     }
-)
-
-register_tool(
-    'delete_shape',
-    'Delete a shape from a board',
-    {
-        'board_id': {
-            'type': 'string',
-            'description': 'The ID of the board'
-        },
-        'item_id': {
-            'type': 'string',
-            'description': 'The ID of the shape item to delete'
+
+
+def _handle_create_shape(arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
+    # Create a new shape from validated arguments
+    try:
+        args = ShapeArgs.from_arguments(arguments)
+    except ValueError as e:
+        return {'error': str(e)}
+    if args.shape_type not in _SHAPE_TYPES:
+        return {'error': f'Unsupported shape_type: {args.shape_type}'}
+
+    result = miro_client.create_shape(
+        board_id=args.board_id,
+        shape_type=args.shape_type,
+        position={'x': args.x, 'y': args.y},
+        geometry={'width': args.width, 'height': args.height},
+        style=args.style() or None,
+        content=args.content
+    )
+    if not result.ok:
+        return {'error': result.error}
+    return {
+        'success': True,
+        'shape': result.value
+    }
+
+
+# Optional update fields defaulted in one merge so a single C-level
+# itemgetter unpack replaces repeated arguments.get calls
+_UPDATE_DEFAULTS = MappingProxyType({
+    'x': None,
+    'y': None,
+    'width': None,
+    'height': None,
+    'content': None
+})
+_UPDATE_KEYS = itemgetter('board_id', 'item_id', 'x', 'y', 'width', 'height', 'content')
+
+
+def _handle_update_shape(arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
+    # Update only the shape properties present in the arguments
+    board_id, item_id, x, y, width, height, content = _UPDATE_KEYS({**_UPDATE_DEFAULTS, **arguments})
+
+    # Each field is tested exactly once; `is not None` keeps numeric zero
+    # as a present value
+    position = {k: float(v) for k, v in (('x', x), ('y', y)) if v is not None} or None
+    geometry = {k: float(v) for k, v in (('width', width), ('height', height)) if v is not None} or None
+
+    try:
+        style = _build_style_dict(arguments) or None
+    except ValueError as e:
+        return {'error': str(e)}
+
+    cache_key = None
+    if (ttl := _update_cache_ttl()) > 0:
+        cache_key = (
+            board_id,
+            item_id,
+            tuple(sorted(position.items())) if position else None,
+            tuple(sorted(geometry.items())) if geometry else None,
+            tuple(sorted(style.items())) if style else None,
+            content
+        )
+        cached = _update_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+    result = miro_client.update_shape(
+        board_id=board_id,
+        item_id=item_id,
+        position=position,
+        geometry=geometry,
+        style=style,
+        content=content
+    )
+    if not result.ok:
+        return {'error': result.error}
+
+    response = {
+        'success': True,
+        'shape': result.value
+    }
+    if cache_key is not None:
+        # Bounded cache: reset wholesale rather than grow without limit
+        if len(_update_cache) >= _UPDATE_CACHE_MAX:
+            _update_cache.clear()
+        _update_cache[cache_key] = (time.monotonic() + ttl, response)
+    return response
+
+
+def _handle_create_shapes_batch(arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
+    # Create many shapes in one tool call, surfacing per-item results
+    board_id = arguments.get('board_id')
+    shapes = []
+    try:
+        specs = [ShapeArgs.from_arguments({**spec, 'board_id': board_id}) for spec in arguments['shapes']]
+    except ValueError as e:
+        return {'error': str(e)}
+    for args in specs:
+        shapes.append({
+            'shape_type': args.shape_type,
+            'x': args.x,
+            'y': args.y,
+            'width': args.width,
+            'height': args.height,
+            'style': args.style() or None,
+            'content': args.content
+        })
+
+    try:
+        results = miro_client.create_shapes(board_id, shapes)
+        return {
+            'success': all('error' not in result for result in results),
+            'results': results
         }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+_DELETE_KEYS = itemgetter('board_id', 'item_id')
+
+
+def _handle_delete_shape(arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
+    # Delete a shape from the board; validation guarantees both keys exist
+    board_id, item_id = _DELETE_KEYS(arguments)
+
+    # Drop memoized updates for the deleted item to avoid stale reads
+    if _update_cache:
+        for key in [k for k in _update_cache if k[0] == board_id and k[1] == item_id]:
+            del _update_cache[key]
+
+    result = miro_client.delete_shape(board_id, item_id)
+    if not result.ok:
+        return {'error': result.error}
+    return {
+        'success': True,
+        'message': 'Shape deleted successfully'
     }
-)
 
 
-def _build_style_dict(arguments: Dict[str, Any]) -> Dict[str, Any]:
-    # Extract style properties from arguments
-    style = {}
-    if arguments.get('fillColor'):
-        style['fillColor'] = arguments['fillColor']
-    if arguments.get('borderColor'):
-        style['borderColor'] = arguments['borderColor']
-    # 0 is a valid borderWidth, so check is not None
-    if arguments.get('borderWidth') is not None:
-        style['borderWidth'] = float(arguments['borderWidth'])
-    return style
+# Tool name -> handler mapping, O(1) dispatch as more shape tools are added
+_HANDLERS: Dict[str, Callable[[Dict[str, Any], MiroClient], Dict[str, Any]]] = {
+    'create_shape': _handle_create_shape,
+    'create_shapes_batch': _handle_create_shapes_batch,
+    'update_shape': _handle_update_shape,
+    'delete_shape': _handle_delete_shape
+}
 
 
 def handle_tool_call(tool_name: str, arguments: Dict[str, Any], miro_client: MiroClient) -> Dict[str, Any]:
-    # Route shape tool calls to appropriate handler
-    if tool_name == 'create_shape':
-        board_id = arguments.get('board_id')
-        shape_type = arguments.get('shape_type')
-        x = arguments.get('x')
-        y = arguments.get('y')
-        width = arguments.get('width')
-        height = arguments.get('height')
-        
-        # 0 is a valid coordinate
-        if not all([board_id, shape_type, x is not None, y is not None, width, height]):
-            return {'error': 'board_id, shape_type, x, y, width, and height are required'}
-        
-        try:
-            result = miro_client.create_shape(
-                board_id=board_id,
-                shape_type=shape_type,
-                position={'x': float(x), 'y': float(y)},
-                geometry={'width': float(width), 'height': float(height)},
-                style=_build_style_dict(arguments) or None,
-                content=arguments.get('content')
-            )
-            return {
-                'success': True,
-                'shape': result
-            }
-        except Exception as e:
-            return {'error': str(e)}
-    
-    elif tool_name == 'update_shape':
-        board_id = arguments.get('board_id')
-        item_id = arguments.get('item_id')
-        
-        if not board_id or not item_id:
-            return {'error': 'board_id and item_id are required'}
-        
-        position = None
-        if arguments.get('x') is not None or arguments.get('y') is not None:
-            position = {}
-            if arguments.get('x') is not None:
-                position['x'] = float(arguments['x'])
-            if arguments.get('y') is not None:
-                position['y'] = float(arguments['y'])
-        
-        geometry = None
-        if arguments.get('width') is not None or arguments.get('height') is not None:
-            geometry = {}
-            if arguments.get('width') is not None:
-                geometry['width'] = float(arguments['width'])
-            if arguments.get('height') is not None:
-                geometry['height'] = float(arguments['height'])
-        
-        try:
-            result = miro_client.update_shape(
-                board_id=board_id,
-                item_id=item_id,
-                position=position,
-                geometry=geometry,
-                style=_build_style_dict(arguments) or None,
-                content=arguments.get('content')
-            )
-            return {
-                'success': True,
-                'shape': result
-            }
-        except Exception as e:
-            return {'error': str(e)}
-    
-    elif tool_name == 'delete_shape':
-        board_id = arguments.get('board_id')
-        item_id = arguments.get('item_id')
-        
-        if not board_id or not item_id:
-            return {'error': 'board_id and item_id are required'}
-        
-        try:
-            miro_client.delete_shape(board_id, item_id)
-            return {
-                'success': True,
-                'message': 'Shape deleted successfully'
-            }
-        except Exception as e:
-            return {'error': str(e)}
-    
-    else:
+    # Route shape tool calls via dict lookup
+    handler = _HANDLERS.get(tool_name)
+    if handler is None:
         return {'error': f'Unknown shape tool: {tool_name}'}
+
+    error = validate_arguments(tool_name, arguments)
+    if error:
+        return {'error': error}
+
+    return handler(arguments, miro_client)